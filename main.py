@@ -1,7 +1,12 @@
+import argparse
 import asyncio
 import logging
+import time
+from src.api.read_api import start_read_api
 from src.core.settings import settings
+from src.scrapers.response_archive import response_archive
 from src.services.parser_service import KomusParserService
+from src.services.product_read_service import ProductReadService
 
 
 def setup_logging():
@@ -9,14 +14,88 @@ def setup_logging():
     logging.basicConfig(level=log_level, format=settings.log_format)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Парсер Komus")
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument("--record", metavar="PATH", help="Записывать сырые ответы в архив")
+    archive.add_argument("--replay", metavar="PATH", help="Воспроизводить ответы из архива без сети")
+    parser.add_argument("--replay-db", metavar="NAME",
+                        help="База для воспроизведения (по умолчанию <DB_NAME>_replay)")
+    parser.add_argument("--serve-api", action="store_true", help="Запустить read API вместе с парсером")
+
+    subparsers = parser.add_subparsers(dest="mode")
+
+    subparsers.add_parser("full", help="Полный обход каталога (по умолчанию)")
+    subparsers.add_parser("serve", help="Только read API без парсинга (свежесть кэша ограничена API_CACHE_TTL_SECONDS)")
+    subparsers.add_parser(
+        "fast", help="Данные из карточек листинга, API только для новых и изменившихся товаров"
+    )
+
+    incremental = subparsers.add_parser(
+        "incremental", help="Обход товаров по приоритету устаревания в пределах бюджета"
+    )
+    incremental.add_argument("--budget-seconds", type=float, default=settings.recrawl_budget_seconds,
+                             help="Бюджет времени на цикл, 0 - без ограничения")
+    incremental.add_argument("--budget-requests", type=int, default=settings.recrawl_budget_requests,
+                             help="Бюджет HTTP запросов на цикл, 0 - без ограничения")
+    incremental.add_argument("--cycles", type=int, default=1,
+                             help="Количество циклов, 0 - бесконечно")
+    incremental.add_argument("--interval", type=float, default=settings.recrawl_interval_seconds,
+                             help="Пауза между циклами в секундах")
+
+    return parser.parse_args()
+
+
 async def main():
+    args = parse_args()
     setup_logging()
     logger = logging.getLogger(__name__)
     logger.info("🚀 Запуск парсера Komus")
 
+    if args.record or args.replay:
+        # Архив должен содержать и обход дерева категорий
+        settings.category_tree_cache_enabled = False
+    if args.record:
+        response_archive.start_recording(args.record)
+    if args.replay:
+        # Снимок из архива не должен попадать в рабочую базу и в состояние планировщика
+        replay_db = args.replay_db or f"{settings.db_name}_replay"
+        if replay_db == settings.db_name:
+            raise SystemExit("--replay-db must differ from DB_NAME")
+        settings.db_name = replay_db
+        settings.crawl_state_enabled = False
+
+        response_archive.start_replay(args.replay)
+        settings.product_delay = 0
+        settings.page_delay = 0
+        logger.info(f"Replaying into database {replay_db}")
+
+    started = time.monotonic()
     async with KomusParserService() as service:
-        await service.run_parsing()
+        api_runner = None
+        if args.serve_api or args.mode == "serve":
+            api_runner = await start_read_api(ProductReadService(service.product_repository))
+
+        try:
+            if args.mode == "serve":
+                await asyncio.Event().wait()
+            elif args.mode == "incremental":
+                await service.run_incremental(
+                    budget_seconds=args.budget_seconds,
+                    budget_requests=args.budget_requests,
+                    cycles=args.cycles,
+                    interval=args.interval,
+                )
+            elif args.mode == "fast":
+                await service.run_fast_parsing()
+            else:
+                await service.run_parsing()
+        finally:
+            if api_runner:
+                await api_runner.cleanup()
+
+    logger.info(f"Finished in {time.monotonic() - started:.1f}s")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
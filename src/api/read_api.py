@@ -0,0 +1,77 @@
+import logging
+
+from aiohttp import web
+
+from src.core.settings import settings
+from src.repository.product_cache import product_cache
+from src.services.product_read_service import ProductReadService
+
+logger = logging.getLogger(__name__)
+
+READ_SERVICE_KEY = web.AppKey("read_service", ProductReadService)
+
+
+async def get_product(request: web.Request) -> web.Response:
+    article = request.match_info["article"]
+    doc = await request.app[READ_SERVICE_KEY].get_product(article)
+
+    if doc is None:
+        return web.json_response({"error": "Product not found"}, status=404)
+    return web.json_response(doc)
+
+
+async def get_products_batch(request: web.Request) -> web.Response:
+    try:
+        payload = await request.json()
+        articles = [str(article) for article in payload["articles"]]
+    except (ValueError, KeyError, TypeError):
+        return web.json_response({"error": "Expected JSON body {\"articles\": [...]}"}, status=400)
+
+    if len(articles) > settings.api_max_batch_size:
+        return web.json_response(
+            {"error": f"Batch size exceeds {settings.api_max_batch_size}"}, status=400
+        )
+
+    docs = await request.app[READ_SERVICE_KEY].get_products(articles)
+    return web.json_response({"items": docs})
+
+
+async def list_category_products(request: web.Request) -> web.Response:
+    category = request.match_info["category"]
+    cursor = request.query.get("cursor") or None
+
+    try:
+        limit = int(request.query.get("limit", settings.api_page_size))
+    except ValueError:
+        return web.json_response({"error": "limit must be an integer"}, status=400)
+    limit = max(1, min(limit, settings.api_max_page_size))
+
+    docs, next_cursor = await request.app[READ_SERVICE_KEY].list_category(category, cursor, limit)
+    return web.json_response({"items": docs, "next_cursor": next_cursor})
+
+
+async def health(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok", "cache": product_cache.stats()})
+
+
+def create_app(read_service: ProductReadService) -> web.Application:
+    app = web.Application()
+    app[READ_SERVICE_KEY] = read_service
+    app.add_routes([
+        web.get("/health", health),
+        web.get("/products/{article}", get_product),
+        web.post("/products/batch", get_products_batch),
+        web.get("/categories/{category}/products", list_category_products),
+    ])
+    return app
+
+
+async def start_read_api(read_service: ProductReadService) -> web.AppRunner:
+    runner = web.AppRunner(create_app(read_service))
+    await runner.setup()
+
+    site = web.TCPSite(runner, settings.api_host, settings.api_port)
+    await site.start()
+
+    logger.info(f"🌐 Read API: http://{settings.api_host}:{settings.api_port}")
+    return runner
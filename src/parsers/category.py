@@ -1,11 +1,13 @@
 import asyncio
 import math
-from typing import List
+import re
+from typing import Callable, List, Optional
 from bs4 import BeautifulSoup
 import logging
 
 from src.core.settings import settings
 from src.parsers.base_parser import BaseParser
+from src.schemas.product import ProductCard
 from src.scrapers.scraper import PageScraper
 
 logger = logging.getLogger(__name__)
@@ -15,25 +17,44 @@ class CategoryParser(BaseParser):
     def __init__(self):
         self.scraper = PageScraper()
 
-    async def parse_page(self, category_url: str) -> List[str]:
-        all_product_links = []
+    async def parse_page(self, category_url: str, items_count: Optional[int] = None) -> List[str]:
+        return await self._parse_listing(category_url, items_count, self._extract_product_links)
+
+    async def parse_cards(self, category_url: str, items_count: Optional[int] = None) -> List[ProductCard]:
+        """Быстрый режим: частичные данные товаров прямо из карточек листинга"""
+        return await self._parse_listing(category_url, items_count, self._extract_cards)
+
+    async def _parse_listing(self, category_url: str, items_count: Optional[int], extract: Callable) -> list:
+        all_items = []
 
         try:
-            category_pages = await self._get_category_pages(category_url)
+            if items_count is not None:
+                # Число товаров известно из дерева категорий, первую страницу не скачиваем
+                category_pages = self._build_pages(category_url, self._pages_count(items_count))
+            else:
+                category_pages = await self._get_category_pages(category_url)
             logger.info(f"Found {len(category_pages)} pages in category")
 
-            for i, page_url in enumerate(category_pages, 1):
+            i = 0
+            while i < len(category_pages):
+                page_url = category_pages[i]
+                i += 1
                 logger.info(f"Processing page {i}/{len(category_pages)}")
-                product_links = await self._get_product_links(page_url)
-                all_product_links.extend(product_links)
+
+                soup = await self._get_page_soup(page_url)
+                if soup is not None:
+                    if i == 1 and items_count is not None:
+                        # Кэшированное число товаров могло устареть - сверяем с заголовком первой страницы
+                        category_pages = self._extend_pages(category_url, category_pages, soup)
+                    all_items.extend(self._extract_page_items(soup, extract))
 
                 if i < len(category_pages):
-                    await asyncio.sleep(1)
+                    await asyncio.sleep(settings.page_delay)
 
         except Exception as e:
             logger.error(f"Error parsing category {category_url}: {e}")
 
-        return all_product_links
+        return all_items
 
     async def _get_category_pages(self, category_url: str) -> List[str]:
         try:
@@ -43,45 +64,144 @@ class CategoryParser(BaseParser):
 
             soup = BeautifulSoup(html, 'html.parser')
             total_pages = self._calculate_pages_count(soup)
-
-            base_url = category_url.split('?')[0].rstrip('/')
-            return [f"{base_url}/?sort=stockRelevance&page={page}"
-                   for page in range(0, total_pages)]
+            return self._build_pages(category_url, total_pages)
 
         except Exception as e:
             logger.error(f"Error getting category pages: {e}")
             return [category_url]
 
-    async def _get_product_links(self, page_url: str) -> List[str]:
+    async def _get_page_soup(self, page_url: str) -> Optional[BeautifulSoup]:
         try:
             html = await self.scraper.scrape_page(page_url)
             if not html:
-                return []
-
-            soup = BeautifulSoup(html, 'html.parser')
-            product_links = []
+                return None
+            return BeautifulSoup(html, 'html.parser')
 
-            links = soup.find_all('a', class_='product-plain__name js-product-variant-name')
-            for link in links:
-                href = link.get('href')
-                if href:
-                    if href.startswith('/'):
-                        href = settings.base_url.rstrip('/') + href
-                    product_links.append(href)
+        except Exception as e:
+            logger.error(f"Error getting page {page_url}: {e}")
+            return None
 
-            logger.info(f"Found {len(product_links)} product links")
-            return product_links
+    def _extract_page_items(self, soup: BeautifulSoup, extract: Callable) -> list:
+        try:
+            items = extract(soup)
+            logger.info(f"Found {len(items)} products on page")
+            return items
 
         except Exception as e:
-            logger.error(f"Error getting product links: {e}")
+            logger.error(f"Error getting products from page: {e}")
             return []
 
+    def _extend_pages(self, category_url: str, category_pages: List[str], soup: BeautifulSoup) -> List[str]:
+        items_count = self.get_items_count(soup)
+        if items_count is None:
+            return category_pages
+
+        total_pages = self._pages_count(items_count)
+        if total_pages <= len(category_pages):
+            return category_pages
+
+        logger.info(f"Category grew to {items_count} items, pages {len(category_pages)} -> {total_pages}")
+        return self._build_pages(category_url, total_pages)
+
+    def _find_product_name_links(self, soup: BeautifulSoup) -> list:
+        return soup.find_all('a', class_='product-plain__name js-product-variant-name')
+
+    def _absolute_url(self, href: str) -> str:
+        if href.startswith('/'):
+            return settings.base_url.rstrip('/') + href
+        return href
+
+    def _extract_product_links(self, soup: BeautifulSoup) -> List[str]:
+        product_links = []
+
+        for link in self._find_product_name_links(soup):
+            href = link.get('href')
+            if href:
+                product_links.append(self._absolute_url(href))
+
+        return product_links
+
+    def _extract_cards(self, soup: BeautifulSoup) -> List[ProductCard]:
+        cards = []
+
+        for link in self._find_product_name_links(soup):
+            href = link.get('href')
+            if not href:
+                continue
+
+            url = self._absolute_url(href)
+            match = re.search(r'/p/(\d+)/', url)
+            if not match:
+                continue
+
+            card = link.find_parent('div', class_='product-plain') or link.parent
+            cards.append(ProductCard(
+                article=match.group(1),
+                title=link.get_text(strip=True),
+                url=url,
+                price=self._get_card_price(card),
+                stock=self._get_card_stock(card)
+            ))
+
+        return cards
+
+    def _get_card_price(self, card) -> Optional[float]:
+        # Микроразметка надежнее верстки, если она есть
+        price_meta = card.find(attrs={'itemprop': 'price'})
+        if price_meta and price_meta.get('content'):
+            try:
+                return float(price_meta['content'])
+            except ValueError:
+                pass
+
+        for elem in card.find_all(class_=re.compile(r'price')):
+            classes = ' '.join(elem.get('class', []))
+            # Зачеркнутая (старая) цена не нужна
+            if re.search(r'old|cross', classes):
+                continue
+            # Берем только вложенные элементы, контейнер содержит и старую цену
+            if elem.find(class_=re.compile(r'price')):
+                continue
+
+            price = self._parse_price(elem.get_text(' ', strip=True))
+            if price is not None:
+                return price
+
+        return None
+
+    def _parse_price(self, text: str) -> Optional[float]:
+        text = re.sub(r'(?<=\d)[\s\u00a0\u202f]+(?=\d)', '', text)
+        match = re.search(r'\d+(?:[.,]\d+)?', text)
+        if not match:
+            return None
+        return float(match.group(0).replace(',', '.'))
+
+    def _get_card_stock(self, card) -> str:
+        stock_elem = card.find(class_=re.compile(r'stock|availab'))
+        if stock_elem:
+            text = stock_elem.get_text(' ', strip=True)
+            if text:
+                return text
+        return 'Нет данных'
+
+    def _build_pages(self, category_url: str, total_pages: int) -> List[str]:
+        base_url = category_url.split('?')[0].rstrip('/')
+        return [f"{base_url}/?sort=stockRelevance&page={page}"
+               for page in range(0, total_pages)]
+
     def _calculate_pages_count(self, soup: BeautifulSoup) -> int:
+        items_count = self.get_items_count(soup)
+        return self._pages_count(items_count) if items_count is not None else 1
+
+    def _pages_count(self, items_count: int) -> int:
+        return max(1, math.ceil(items_count / 30))
+
+    @staticmethod
+    def get_items_count(soup: BeautifulSoup) -> Optional[int]:
         try:
             items_count_elem = soup.find('span', class_="catalog__header-sup")
             if items_count_elem:
-                items_count = int(items_count_elem.get_text(strip=True))
-                return max(1, math.ceil(items_count / 30))
-            return 1
+                return int(items_count_elem.get_text(strip=True))
+            return None
         except (ValueError, AttributeError):
-            return 1
\ No newline at end of file
+            return None
\ No newline at end of file
@@ -4,10 +4,10 @@ import html
 import logging
 from typing import List, Optional, Dict, Any, Tuple
 import json
-import httpx
 
 from src.parsers.base_parser import BaseParser
 from src.schemas.product import Product, Attribute, PriceInfo, SupplierOffer, Supplier
+from src.scrapers.proxy_pool import proxy_pool
 
 logger = logging.getLogger(__name__)
 
@@ -95,20 +95,19 @@ class KomusParser(BaseParser):
             if self.product_url:
                 base_headers['referer'] = self.product_url
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Запрос 1: PriceBlock API (POST)
-                price_data = await self._get_price_block_data(client, base_headers)
+            # Запрос 1: PriceBlock API (POST)
+            price_data = await self._get_price_block_data(base_headers)
 
-                # Запрос 2: Product API (GET)
-                product_data = await self._get_product_details_data(client, base_headers)
+            # Запрос 2: Product API (GET)
+            product_data = await self._get_product_details_data(base_headers)
 
-                return price_data, product_data
+            return price_data, product_data
 
         except Exception as e:
             logger.error(f"Error getting combined API data: {e}")
             return None, None
 
-    async def _get_price_block_data(self, client: httpx.AsyncClient, base_headers: Dict) -> Optional[Dict]:
+    async def _get_price_block_data(self, base_headers: Dict) -> Optional[Dict]:
         """Получает данные о цене и наличии"""
         try:
             price_url = f"https://www.komus.ru/api/priceBlock/{self.product_id}"
@@ -120,7 +119,7 @@ class KomusParser(BaseParser):
                 'priority': 'u=1, i'
             })
 
-            response = await client.post(price_url, headers=headers)
+            response = await proxy_pool.request('POST', price_url, headers=headers)
 
             if response.status_code == 200:
                 return response.json()
@@ -132,7 +131,7 @@ class KomusParser(BaseParser):
             logger.error(f"Error getting price block data: {e}")
             return None
 
-    async def _get_product_details_data(self, client: httpx.AsyncClient, base_headers: Dict) -> Optional[Dict]:
+    async def _get_product_details_data(self, base_headers: Dict) -> Optional[Dict]:
         """Получает детальные характеристики товара"""
         try:
             product_url = f"https://www.komus.ru/api/product/{self.product_id}"
@@ -144,7 +143,7 @@ class KomusParser(BaseParser):
             headers = base_headers.copy()
             headers['priority'] = 'u=1, i'
 
-            response = await client.get(product_url, params=params, headers=headers)
+            response = await proxy_pool.request('GET', product_url, params=params, headers=headers)
 
             if response.status_code == 200:
                 return response.json()
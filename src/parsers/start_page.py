@@ -1,20 +1,30 @@
 import asyncio
-from typing import List, Callable
+from datetime import datetime, timedelta
+from typing import List, Callable, Dict, Optional
 from bs4 import BeautifulSoup
 import logging
 
 from src.core.settings import settings
 from src.parsers.base_parser import BaseParser
+from src.parsers.category import CategoryParser
+from src.repository.category_tree_repository import CategoryTreeRepository
 from src.scrapers.scraper import PageScraper
 
 logger = logging.getLogger(__name__)
 
+CATEGORIES_URL = 'https://www.komus.ru/katalog/c/0/?from=menu-v1-vse_kategorii'
+
 
 class StartPageParser(BaseParser):
     def __init__(self):
         self.scraper = PageScraper()
+        self.tree_repository = CategoryTreeRepository()
         self.visited = set()
+        self.nodes: Dict[str, dict] = {}
+        # Страницы, которые не удалось скачать или разобрать при обходе
+        self.errors = 0
         self.processed_count = 0
+        self.process_category: Optional[Callable] = None
 
     async def parse_page(self, *args, **kwargs) -> List[str]:
         return []
@@ -22,22 +32,85 @@ class StartPageParser(BaseParser):
     async def parse_and_process(self, process_category_func: Callable) -> int:
         self.process_category = process_category_func
 
-        categories_url = 'https://www.komus.ru/katalog/c/0/?from=menu-v1-vse_kategorii'
+        if settings.category_tree_cache_enabled:
+            cached_tree = await self.tree_repository.load()
+            if cached_tree and cached_tree.get("nodes"):
+                return await self._process_cached_tree(cached_tree)
+
+        await self._discover_tree()
+        await self._save_tree()
+        return self.processed_count
+
+    async def _process_cached_tree(self, cached_tree: dict) -> int:
+        age = datetime.utcnow() - cached_tree["discovered_at"]
+        leaves = [node for node in cached_tree["nodes"] if node.get("is_leaf")]
+        logger.info(f"Loaded cached category tree: {len(leaves)} categories, age {age}")
+
+        revalidation = None
+        if age > timedelta(hours=settings.category_tree_ttl_hours):
+            logger.info("Category tree cache expired, revalidating in background")
+            revalidation = asyncio.create_task(self._revalidate_tree())
+
+        try:
+            for leaf in leaves:
+                self.processed_count += 1
+                await self.process_category(leaf["url"], self.processed_count, leaf.get("items_count"))
+        except BaseException:
+            # Ошибка или отмена обхода: фоновая задача не должна остаться висеть
+            if revalidation:
+                revalidation.cancel()
+                await asyncio.gather(revalidation, return_exceptions=True)
+            raise
+
+        if revalidation:
+            await revalidation
+
+        return self.processed_count
 
-        html = await self.scraper.scrape_page(categories_url)
+    async def _revalidate_tree(self):
+        try:
+            discovery = StartPageParser()
+            await discovery._discover_tree()
+            await discovery._save_tree()
+        except Exception as e:
+            logger.error(f"Error revalidating category tree: {e}")
+
+    async def _discover_tree(self):
+        html = await self.scraper.scrape_page(CATEGORIES_URL)
         if not html:
-            return 0
+            self.errors += 1
+            return
 
         main_categories = self._extract_categories(html)
         logger.info(f"Found main categories: {len(main_categories)}")
 
         for i, category_url in enumerate(main_categories):
             logger.info(f"Main category {i + 1}/{len(main_categories)}")
-            await self._process_category_recursive(category_url)
+            await self._process_category_recursive(category_url, parent=CATEGORIES_URL)
 
-        return self.processed_count
+    async def _save_tree(self):
+        leaves_count = sum(1 for node in self.nodes.values() if node["is_leaf"])
+        if not leaves_count:
+            await self.tree_repository.touch()
+            return
 
-    async def _process_category_recursive(self, category_url: str, level: int = 0):
+        # Частичный обход при деградации сайта не должен затирать полное дерево,
+        # а обход без ошибок принимаем, даже если каталог действительно сократился
+        cached_tree = await self.tree_repository.load()
+        if cached_tree:
+            cached_leaves = sum(1 for node in cached_tree.get("nodes", []) if node.get("is_leaf"))
+            if leaves_count < cached_leaves * settings.category_tree_min_leaf_ratio:
+                if self.errors:
+                    logger.warning(f"Discovered {leaves_count} categories vs {cached_leaves} cached "
+                                   f"with {self.errors} errors, keeping cached category tree")
+                    # Иначе TTL остается истекшим и каждый запуск повторяет полный обход
+                    await self.tree_repository.touch()
+                    return
+                logger.info(f"Category tree shrank from {cached_leaves} to {leaves_count} categories")
+
+        await self.tree_repository.save(list(self.nodes.values()))
+
+    async def _process_category_recursive(self, category_url: str, level: int = 0, parent: str = None):
         if category_url in self.visited:
             return
 
@@ -49,27 +122,45 @@ class StartPageParser(BaseParser):
 
             html = await self.scraper.scrape_page(category_url)
             if not html:
+                self.errors += 1
                 return
 
             soup = BeautifulSoup(html, 'html.parser')
 
             if self._has_products(soup):
                 logger.info(f"{indent}Found category with products")
-                self.processed_count += 1
-                await self.process_category(category_url, self.processed_count)
+                items_count = CategoryParser.get_items_count(soup)
+                self._add_node(category_url, parent, is_leaf=True, items_count=items_count)
+
+                if self.process_category:
+                    self.processed_count += 1
+                    await self.process_category(category_url, self.processed_count, items_count)
                 return
 
-            subcategories = self._extract_categories(html)
+            self._add_node(category_url, parent, is_leaf=False)
+            subcategories = self._extract_categories(soup)
 
             if subcategories:
                 logger.info(f"{indent}Found subcategories: {len(subcategories)}")
                 for subcat_url in subcategories:
                     if subcat_url not in self.visited:
-                        await self._process_category_recursive(subcat_url, level + 1)
+                        await self._process_category_recursive(subcat_url, level + 1, parent=category_url)
+            else:
+                # Ни товаров, ни подкатегорий - скорее всего страница ошибки
+                self.errors += 1
 
         except Exception as e:
+            self.errors += 1
             logger.error(f"{indent}Error processing {category_url}: {e}")
 
+    def _add_node(self, url: str, parent: Optional[str], is_leaf: bool, items_count: Optional[int] = None):
+        self.nodes[url] = {
+            "url": url,
+            "parent": parent,
+            "is_leaf": is_leaf,
+            "items_count": items_count,
+        }
+
     def _has_products(self, soup: BeautifulSoup) -> bool:
         return bool(soup.find('div', class_='product-plain') or
                     soup.find('a', class_='product-plain__name'))
@@ -89,4 +180,4 @@ class StartPageParser(BaseParser):
                 full_url = settings.base_url.rstrip('/') + href if href.startswith('/') else href
                 categories.append(full_url)
 
-        return categories
\ No newline at end of file
+        return categories
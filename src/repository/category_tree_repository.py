@@ -0,0 +1,48 @@
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from src.core.settings import settings
+from src.repository.mongo_client import mongo_client
+
+logger = logging.getLogger(__name__)
+
+TREE_ID = "komus"
+
+
+class CategoryTreeRepository:
+    """Хранит обнаруженное дерево категорий: узлы, связи с родителями и число товаров"""
+
+    def __init__(self):
+        self._collection = None
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = mongo_client.get_collection(settings.category_tree_collection_name)
+        return self._collection
+
+    async def load(self) -> Optional[dict]:
+        try:
+            return await self.collection.find_one({"_id": TREE_ID})
+        except Exception as e:
+            logger.error(f"❌ Ошибка загрузки дерева категорий: {e}")
+            return None
+
+    async def save(self, nodes: List[dict]):
+        try:
+            await self.collection.replace_one(
+                {"_id": TREE_ID},
+                {"_id": TREE_ID, "discovered_at": datetime.utcnow(), "nodes": nodes},
+                upsert=True
+            )
+            logger.info(f"💾 Дерево категорий сохранено: {len(nodes)} узлов")
+        except Exception as e:
+            logger.error(f"❌ Ошибка сохранения дерева категорий: {e}")
+
+    async def touch(self):
+        """Продлевает TTL сохраненного дерева, не меняя узлы"""
+        try:
+            await self.collection.update_one({"_id": TREE_ID}, {"$set": {"discovered_at": datetime.utcnow()}})
+        except Exception as e:
+            logger.error(f"❌ Ошибка обновления дерева категорий: {e}")
@@ -0,0 +1,121 @@
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from pymongo import UpdateOne
+
+from src.core.settings import settings
+from src.repository.mongo_client import mongo_client
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlStateRepository:
+    """Метаданные обхода по артикулам: когда товар скачан, когда и как часто меняется"""
+
+    def __init__(self):
+        self._collection = None
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = mongo_client.get_collection(settings.crawl_state_collection_name)
+        return self._collection
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("article", unique=True)
+
+    async def record_fetch(self, article: str, url: str, changed: bool):
+        try:
+            now = datetime.utcnow()
+            existing = await self.collection.find_one({"article": article}) or {}
+
+            # Первое скачивание не считается изменением - сравнивать было не с чем
+            changed = changed and existing.get("last_fetched") is not None
+
+            first_fetched = existing.get("first_fetched") or now
+            change_count = existing.get("change_count", 0) + (1 if changed else 0)
+
+            update = {
+                "url": url,
+                "first_fetched": first_fetched,
+                "last_fetched": now,
+                "change_count": change_count,
+                "fetch_count": existing.get("fetch_count", 0) + 1,
+                "change_rate": self.change_rate(change_count, first_fetched, now),
+                "failure_count": 0,
+            }
+            if changed:
+                update["last_changed"] = now
+
+            await self.collection.update_one({"article": article}, {"$set": update}, upsert=True)
+
+        except Exception as e:
+            logger.error(f"❌ Ошибка сохранения состояния {article}: {e}")
+
+    async def record_failure(self, article: str, url: str):
+        """Неудачная попытка не трогает last_fetched, иначе товар будет выглядеть свежим.
+
+        failure_count подряд идущих неудач понижает приоритет, чтобы мертвые товары не съедали бюджет.
+        """
+        try:
+            await self.collection.update_one(
+                {"article": article},
+                {
+                    "$set": {"url": url, "last_failed": datetime.utcnow()},
+                    "$inc": {"failure_count": 1},
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"❌ Ошибка сохранения состояния {article}: {e}")
+
+    async def seed_from_products(self) -> int:
+        """Добавляет в состояние артикулы из коллекции товаров, которых там еще нет"""
+        known = set()
+        async for doc in self.collection.find({}, {"article": 1, "_id": 0}):
+            known.add(doc.get("article"))
+
+        products = mongo_client.get_collection(settings.collection_name)
+        cursor = products.find(
+            {}, {"article": 1, "suppliers.supplier_offers.purchase_url": 1, "listing.url": 1, "_id": 0}
+        )
+
+        operations = []
+        async for doc in cursor:
+            article = doc.get("article")
+            if not article or article in known:
+                continue
+
+            url = self._purchase_url(doc) or f"{settings.base_url.rstrip('/')}/p/{article}/"
+            operations.append(UpdateOne(
+                {"article": article},
+                {"$setOnInsert": {"article": article, "url": url}},
+                upsert=True
+            ))
+
+        if not operations:
+            return 0
+
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return result.upserted_count
+
+    async def get_all(self) -> List[dict]:
+        return await self.collection.find({}, {"_id": 0}).to_list(length=None)
+
+    @staticmethod
+    def change_rate(change_count: int, first_fetched: datetime, now: datetime) -> float:
+        """Оценка частоты изменений в час с априорным одним изменением за recrawl_prior_hours"""
+        observed_hours = (now - first_fetched).total_seconds() / 3600
+        return (change_count + 1) / (observed_hours + settings.recrawl_prior_hours)
+
+    def _purchase_url(self, doc: dict) -> Optional[str]:
+        # Частичные записи из листинга еще не имеют предложений поставщика
+        if (doc.get("listing") or {}).get("url"):
+            return doc["listing"]["url"]
+
+        for supplier in doc.get("suppliers") or []:
+            for offer in supplier.get("supplier_offers") or []:
+                if offer.get("purchase_url"):
+                    return offer["purchase_url"]
+        return None
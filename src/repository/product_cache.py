@@ -0,0 +1,67 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+from src.core.settings import settings
+
+
+class ProductCache:
+    """LRU кэш документов товаров по артикулу с TTL.
+
+    Инвалидация из ProductRepository работает только внутри процесса, поэтому отдельный
+    `main.py serve` полагается на TTL. Чтение из базы оформляется через start_read/finish_read:
+    если во время чтения товар инвалидировали, прочитанный документ в кэш не кладется.
+    """
+
+    def __init__(self, max_size: int = None, ttl: float = None):
+        self.max_size = settings.api_cache_size if max_size is None else max_size
+        self.ttl = settings.api_cache_ttl_seconds if ttl is None else ttl
+        self._items: OrderedDict = OrderedDict()
+        self._reading: Dict[str, int] = {}
+        self._dirty: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, article: str) -> Optional[dict]:
+        entry = self._items.get(article)
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                del self._items[article]
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(article)
+        self.hits += 1
+        return entry[0]
+
+    def start_read(self, article: str):
+        self._reading[article] = self._reading.get(article, 0) + 1
+
+    def finish_read(self, article: str, doc: Optional[dict]):
+        if doc is not None and article not in self._dirty:
+            self._put(article, doc)
+
+        self._reading[article] -= 1
+        if not self._reading[article]:
+            del self._reading[article]
+            self._dirty.discard(article)
+
+    def _put(self, article: str, doc: dict):
+        if self.max_size <= 0:
+            return
+
+        self._items[article] = (doc, time.monotonic() + self.ttl)
+        self._items.move_to_end(article)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, article: str):
+        self._items.pop(article, None)
+        if article in self._reading:
+            self._dirty.add(article)
+
+    def stats(self) -> dict:
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+product_cache = ProductCache()
@@ -1,7 +1,11 @@
 import logging
+from datetime import datetime
+from typing import List, Optional
+from pymongo import UpdateOne
 from src.core.settings import settings
 from src.repository.mongo_client import mongo_client
-from src.schemas.product import Product
+from src.repository.product_cache import product_cache
+from src.schemas.product import Product, ProductCard, stock_status
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +20,27 @@ class ProductRepository:
             self._collection = mongo_client.get_collection(settings.collection_name)
         return self._collection
 
-    async def save_product(self, product: Product):
+    async def ensure_indexes(self):
+        await self.collection.create_index("article")
+        await self.collection.create_index([("category", 1), ("article", 1)])
+
+    async def get_by_article(self, article: str) -> Optional[dict]:
+        return await self.collection.find_one({"article": article}, {"_id": 0})
+
+    async def get_by_articles(self, articles: List[str]) -> List[dict]:
+        cursor = self.collection.find({"article": {"$in": articles}}, {"_id": 0})
+        return await cursor.to_list(length=None)
+
+    async def list_by_category(self, category: str, cursor: Optional[str], limit: int) -> List[dict]:
+        query = {"category": category}
+        if cursor:
+            query["article"] = {"$gt": cursor}
+
+        documents = self.collection.find(query, {"_id": 0}).sort("article", 1).limit(limit)
+        return await documents.to_list(length=limit)
+
+    async def save_product(self, product: Product) -> Optional[bool]:
+        """Сохраняет товар, возвращает True если данные изменились и None при ошибке"""
         try:
             product_dict = product.model_dump()
 
@@ -24,14 +48,101 @@ class ProductRepository:
             existing = await self.collection.find_one({"article": product.article})
 
             if existing:
+                changed = self._is_changed(existing, product_dict)
                 await self.collection.update_one(
                     {"article": product.article},
-                    {"$set": product_dict}
+                    {"$set": product_dict, "$unset": {"needs_enrichment": ""}}
                 )
+                if changed:
+                    product_cache.invalidate(product.article)
                 logger.info(f"📝 Обновлен: {product.article}")
+                return changed
             else:
                 await self.collection.insert_one(product_dict)
+                product_cache.invalidate(product.article)
                 logger.info(f"💾 Сохранен: {product.article}")
+                return True
 
         except Exception as e:
-            logger.error(f"❌ Ошибка сохранения: {e}")
\ No newline at end of file
+            logger.error(f"❌ Ошибка сохранения: {e}")
+            return None
+
+    def _is_changed(self, existing: dict, product_dict: dict) -> bool:
+        # created_at меняется при каждом парсинге и не считается изменением
+        return any(existing.get(key) != value
+                   for key, value in product_dict.items()
+                   if key != "created_at")
+
+    async def upsert_cards(self, cards: List[ProductCard]) -> List[ProductCard]:
+        """Пакетно сохраняет данные из листинга, возвращает карточки, которым нужно полное обогащение через API"""
+        if not cards:
+            return []
+
+        try:
+            articles = [card.article for card in cards]
+            existing = {}
+            cursor = self.collection.find(
+                {"article": {"$in": articles}},
+                {"article": 1, "description": 1, "listing": 1, "needs_enrichment": 1,
+                 "suppliers.supplier_offers.price": 1}
+            )
+            async for doc in cursor:
+                existing[doc["article"]] = doc
+
+            updated_at = datetime.now().strftime("%d.%m.%Y %H:%M")
+            operations = []
+            to_enrich = []
+
+            for card in cards:
+                doc = existing.get(card.article)
+                listing = {
+                    "price": card.price,
+                    "stock": card.stock,
+                    "url": card.url,
+                    "updated_at": updated_at,
+                }
+                fields = {"listing": listing}
+
+                if (doc is None or "description" not in doc or doc.get("needs_enrichment")
+                        or self._is_listing_changed(doc, card)):
+                    to_enrich.append(card)
+                    # Флаг снимает save_product: если обогащение упадет, товар попадет в следующий прогон
+                    fields["needs_enrichment"] = True
+
+                operations.append(UpdateOne(
+                    {"article": card.article},
+                    {
+                        "$set": fields,
+                        "$setOnInsert": {"article": card.article, "title": card.title},
+                    },
+                    upsert=True
+                ))
+
+            result = await self.collection.bulk_write(operations, ordered=False)
+            for card in to_enrich:
+                product_cache.invalidate(card.article)
+
+            logger.info(f"📦 Листинг: {len(cards)} карточек, новых {result.upserted_count}, "
+                        f"на обогащение {len(to_enrich)}")
+            return to_enrich
+
+        except Exception as e:
+            logger.error(f"❌ Ошибка пакетного сохранения: {e}")
+            return []
+
+    def _is_listing_changed(self, doc: dict, card: ProductCard) -> bool:
+        listing = doc.get("listing")
+        if listing:
+            # Остаток меняется постоянно, на обогащение отправляем только смену статуса наличия
+            return (listing.get("price") != card.price or
+                    stock_status(listing.get("stock")) != stock_status(card.stock))
+
+        # Листинга еще не было - сравниваем с базовой ценой из полного парсинга
+        if card.price is None:
+            return False
+        for supplier in doc.get("suppliers") or []:
+            for offer in supplier.get("supplier_offers") or []:
+                prices = offer.get("price") or []
+                if prices:
+                    return prices[0].get("price") != card.price
+        return False
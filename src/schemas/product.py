@@ -1,4 +1,5 @@
-from typing import List
+import re
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -43,4 +44,28 @@ class Product(BaseModel):
         default_factory=lambda: datetime.now().strftime("%d.%m.%Y %H:%M")
     )
     attributes: List[Attribute] = Field(default_factory=list)
-    suppliers: List[Supplier] = Field(default_factory=list)
\ No newline at end of file
+    suppliers: List[Supplier] = Field(default_factory=list)
+
+
+class ProductCard(BaseModel):
+    """Частичные данные товара из карточки на странице листинга"""
+    article: str
+    title: str
+    url: str
+    price: Optional[float] = None
+    stock: str = 'Нет данных'
+
+
+def stock_status(stock: Optional[str]) -> str:
+    """Статус наличия без количества: "В наличии 1 250 пачек" и "В наличии 30 пачек" совпадают"""
+    text = (stock or '').lower()
+    if 'нет в наличии' in text or 'отсутств' in text:
+        return 'out_of_stock'
+    if 'заказ' in text:
+        return 'to_order'
+    if 'мало' in text:
+        return 'low'
+    if 'в наличии' in text:
+        return 'in_stock'
+    # Незнакомая формулировка: сравниваем текст без чисел
+    return re.sub(r'[\d\s]+', ' ', text).strip()
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+SUCCESS = "success"
+FAILURE = "failure"
+# Исход не говорит о состоянии эндпоинта: проба освобождается без смены состояния
+NEUTRAL = "neutral"
+
+
+def endpoint_key(url: str) -> str:
+    """Группирует URL по эндпоинту: api/priceBlock, api/product, katalog, p ..."""
+    parts = urlsplit(url)
+    segments = [s for s in parts.path.split('/') if s]
+
+    if not segments:
+        return parts.netloc or "/"
+    if segments[0] == 'api' and len(segments) > 1:
+        return f"{parts.netloc}/api/{segments[1]}"
+    return f"{parts.netloc}/{segments[0]}"
+
+
+class LatencyTracker:
+    """Скользящее окно задержек и таймаут на основе перцентиля"""
+
+    def __init__(self):
+        self.samples: Deque[float] = deque(maxlen=settings.timeout_window)
+
+    def record(self, latency: float):
+        self.samples.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+    def timeout(self) -> float:
+        if len(self.samples) < settings.timeout_min_samples:
+            return settings.request_timeout
+
+        value = self.percentile(settings.timeout_percentile) * settings.timeout_multiplier
+        return max(settings.timeout_min, min(settings.request_timeout, value))
+
+
+class CircuitBreaker:
+    """Размыкается при серии ошибок, после паузы пропускает одну пробу"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.failures: Deque[float] = deque()
+        self.open_until = 0.0
+        self.open_seconds = settings.breaker_open_seconds
+        self.probe_in_flight = False
+        self.opened_count = 0
+
+    async def wait_ready(self):
+        while True:
+            now = time.monotonic()
+
+            if self.state == CLOSED:
+                return
+
+            if self.state == OPEN:
+                if now < self.open_until:
+                    await asyncio.sleep(self.open_until - now)
+                    continue
+                self._set_state(HALF_OPEN)
+
+            if not self.probe_in_flight:
+                self.probe_in_flight = True
+                return
+
+            await asyncio.sleep(settings.breaker_probe_interval)
+
+    def record_success(self):
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = False
+            self.open_seconds = settings.breaker_open_seconds
+            self.failures.clear()
+            self._set_state(CLOSED)
+
+    def release_probe(self):
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        now = time.monotonic()
+
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = False
+            self.open_seconds = min(self.open_seconds * 2, settings.breaker_max_open_seconds)
+            self._open(now)
+            return
+
+        self.failures.append(now)
+        while self.failures and now - self.failures[0] > settings.breaker_failure_window:
+            self.failures.popleft()
+
+        if self.state == CLOSED and len(self.failures) >= settings.breaker_failure_threshold:
+            self._open(now)
+
+    def _open(self, now: float):
+        self.open_until = now + self.open_seconds
+        self.opened_count += 1
+        self._set_state(OPEN)
+
+    def _set_state(self, state: str):
+        if state == self.state:
+            return
+
+        if state == OPEN:
+            logger.warning(f"Circuit {self.name}: {self.state} -> {state}, pause {self.open_seconds:.0f}s")
+        else:
+            logger.info(f"Circuit {self.name}: {self.state} -> {state}")
+        self.state = state
+
+
+class EndpointStats:
+    def __init__(self, name: str):
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker(name)
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+
+
+class EndpointGuard:
+    """Адаптивные таймауты и circuit breaker для каждого эндпоинта komus.ru"""
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = {}
+
+    def _stats(self, url: str) -> EndpointStats:
+        key = endpoint_key(url)
+        if key not in self.endpoints:
+            self.endpoints[key] = EndpointStats(key)
+        return self.endpoints[key]
+
+    async def request(self, client: httpx.AsyncClient, method: str, url: str,
+                      proxied: bool = False, **kwargs) -> httpx.Response:
+        stats = self._stats(url)
+        await stats.breaker.wait_ready()
+
+        timeout = stats.latency.timeout()
+        stats.requests += 1
+        started = time.monotonic()
+        outcome = None
+
+        try:
+            response = await client.request(method, url, timeout=timeout, **kwargs)
+        except httpx.TimeoutException as exc:
+            if proxied and isinstance(exc, (httpx.ConnectTimeout, httpx.PoolTimeout)):
+                # Прокси молча не принимает соединение - это сбой прокси, а не эндпоинта
+                outcome = NEUTRAL
+                raise
+
+            stats.timeouts += 1
+            # Таймаут учитываем как цензурированное наблюдение, иначе перцентиль занижается
+            stats.latency.record(timeout)
+            outcome = FAILURE
+            raise
+        except (httpx.ProxyError, httpx.ConnectError):
+            # Через прокси это сбой самого прокси, его учитывает ProxyPool
+            outcome = NEUTRAL if proxied else FAILURE
+            raise
+        except httpx.TransportError:
+            outcome = FAILURE
+            raise
+        else:
+            stats.latency.record(time.monotonic() - started)
+            if response.status_code == 429:
+                # Лимит на IP, а не деградация эндпоинта: учитывается в здоровье прокси
+                outcome = NEUTRAL
+            else:
+                outcome = FAILURE if response.status_code >= 500 else SUCCESS
+            return response
+        finally:
+            # Любой выход, включая отмену и неожиданные исключения, должен освободить пробу
+            self._settle(stats, FAILURE if outcome is None else outcome)
+
+    def _settle(self, stats: EndpointStats, outcome: str):
+        if outcome == FAILURE:
+            stats.failures += 1
+            stats.breaker.record_failure()
+        elif outcome == SUCCESS:
+            stats.breaker.record_success()
+        else:
+            stats.breaker.release_probe()
+
+    def total_requests(self) -> int:
+        return sum(stats.requests for stats in self.endpoints.values())
+
+    def metrics(self) -> Dict[str, Dict]:
+        result = {}
+        for key, stats in self.endpoints.items():
+            p50 = stats.latency.percentile(0.5)
+            p95 = stats.latency.percentile(0.95)
+            result[key] = {
+                "state": stats.breaker.state,
+                "timeout": round(stats.latency.timeout(), 2),
+                "p50": round(p50, 3) if p50 is not None else None,
+                "p95": round(p95, 3) if p95 is not None else None,
+                "requests": stats.requests,
+                "failures": stats.failures,
+                "timeouts": stats.timeouts,
+                "opened": stats.breaker.opened_count,
+            }
+        return result
+
+    def log_metrics(self):
+        for key, values in self.metrics().items():
+            logger.info(f"Endpoint {key}: {values}")
+
+
+endpoint_guard = EndpointGuard()
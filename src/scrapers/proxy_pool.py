@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from src.core.settings import settings
+from src.scrapers.endpoint_guard import endpoint_guard
+from src.scrapers.response_archive import request_key, response_archive
+
+logger = logging.getLogger(__name__)
+
+
+class ProxyEndpoint:
+    """Прокси со своим пулом соединений и метриками здоровья"""
+
+    def __init__(self, url: Optional[str]):
+        self.url = url
+        self.name = url or "direct"
+        self.client: Optional[httpx.AsyncClient] = None
+
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.throttle_rate = 0.0
+        self.consecutive_failures = 0
+
+        self.benched_until = 0.0
+        self.bench_seconds = settings.proxy_bench_seconds
+
+        self.requests = 0
+        self.failures = 0
+        self.throttled = 0
+
+    def get_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                proxy=self.url,
+                timeout=settings.request_timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.proxy_max_connections,
+                    max_keepalive_connections=settings.proxy_max_connections,
+                ),
+            )
+        return self.client
+
+    def is_benched(self, now: float) -> bool:
+        return now < self.benched_until
+
+    def score(self) -> float:
+        latency = self.latency if self.latency is not None else settings.proxy_default_latency
+        health = max(0.01, (1 - self.error_rate) * (1 - self.throttle_rate))
+        return health / max(latency, 0.05)
+
+    def record(self, latency: Optional[float], status_code: Optional[int]):
+        """status_code=None - ответ через прокси не получен.
+
+        5xx считается успехом прокси: ответ доставлен, деградацию сайта учитывает EndpointGuard.
+        """
+        alpha = settings.proxy_ewma_alpha
+        self.requests += 1
+
+        failed = status_code is None
+        throttled = status_code == 429
+
+        if latency is not None:
+            self.latency = latency if self.latency is None else (1 - alpha) * self.latency + alpha * latency
+
+        self.error_rate = (1 - alpha) * self.error_rate + alpha * (1.0 if failed else 0.0)
+        self.throttle_rate = (1 - alpha) * self.throttle_rate + alpha * (1.0 if throttled else 0.0)
+
+        if failed or throttled:
+            self.failures += failed
+            self.throttled += throttled
+            self.consecutive_failures += 1
+        else:
+            self.consecutive_failures = 0
+            self.bench_seconds = settings.proxy_bench_seconds
+
+        if self._should_bench():
+            self._bench()
+
+    def _should_bench(self) -> bool:
+        if self.consecutive_failures >= settings.proxy_bench_failures:
+            return True
+        return (self.requests >= settings.proxy_bench_min_requests and
+                self.error_rate + self.throttle_rate >= settings.proxy_bench_error_rate)
+
+    def _bench(self):
+        self.benched_until = time.monotonic() + self.bench_seconds
+        logger.warning(f"Proxy {self.name} benched for {self.bench_seconds:.0f}s "
+                       f"(errors={self.error_rate:.2f}, 429={self.throttle_rate:.2f})")
+
+        self.bench_seconds = min(self.bench_seconds * 2, settings.proxy_max_bench_seconds)
+        # После паузы прокси получает пробный трафик с частично сброшенной статистикой
+        self.consecutive_failures = 0
+        self.error_rate /= 2
+        self.throttle_rate /= 2
+
+
+class ProxyPool:
+    """Распределяет запросы между прокси пропорционально их здоровью"""
+
+    def __init__(self, proxies: Optional[List[str]] = None):
+        proxies = settings.proxies if proxies is None else proxies
+        self.endpoints = [ProxyEndpoint(url) for url in proxies] or [ProxyEndpoint(None)]
+
+    async def acquire(self) -> ProxyEndpoint:
+        now = time.monotonic()
+        available = [p for p in self.endpoints if not p.is_benched(now)]
+
+        if not available:
+            # Все прокси (или единственное прямое подключение) на паузе - ждем ближайшее
+            proxy = min(self.endpoints, key=lambda p: p.benched_until)
+            await asyncio.sleep(proxy.benched_until - now)
+            return proxy
+        if len(available) == 1:
+            return available[0]
+
+        weights = [p.score() for p in available]
+        return random.choices(available, weights=weights, k=1)[0]
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if response_archive.is_replaying:
+            return response_archive.replay(request_key(method, url, kwargs.get('params')))
+
+        proxy = await self.acquire()
+
+        try:
+            response = await endpoint_guard.request(
+                proxy.get_client(), method, url, proxied=proxy.url is not None, **kwargs
+            )
+        except httpx.TransportError:
+            proxy.record(None, None)
+            raise
+
+        proxy.record(response.elapsed.total_seconds(), response.status_code)
+
+        if response_archive.is_recording:
+            response_archive.record(request_key(method, url, kwargs.get('params')), response)
+        return response
+
+    def metrics(self) -> Dict[str, Dict]:
+        now = time.monotonic()
+        return {
+            p.name: {
+                "score": round(p.score(), 3),
+                "latency": round(p.latency, 3) if p.latency is not None else None,
+                "error_rate": round(p.error_rate, 3),
+                "throttle_rate": round(p.throttle_rate, 3),
+                "benched": p.is_benched(now),
+                "requests": p.requests,
+                "failures": p.failures,
+                "throttled": p.throttled,
+            }
+            for p in self.endpoints
+        }
+
+    def log_metrics(self):
+        for name, values in self.metrics().items():
+            logger.info(f"Proxy {name}: {values}")
+
+    async def close(self):
+        for proxy in self.endpoints:
+            if proxy.client is not None:
+                await proxy.client.aclose()
+                proxy.client = None
+
+
+proxy_pool = ProxyPool()
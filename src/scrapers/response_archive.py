@@ -0,0 +1,141 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import BinaryIO, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RECORD_MAGIC = b'KRA1'
+# magic, длина сжатых метаданных, длина сжатого тела
+RECORD_HEADER = struct.Struct('<4sII')
+
+# Тело хранится уже декодированным, эти заголовки при воспроизведении сломают ответ
+SKIPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+def request_key(method: str, url: str, params: Optional[dict] = None) -> str:
+    full_url = httpx.URL(url)
+    if params:
+        full_url = full_url.copy_merge_params(params)
+    return f"{method.upper()} {full_url}"
+
+
+class ResponseArchive:
+    """Append-only архив сырых ответов: запись при обходе и воспроизведение из mmap
+
+    Каждая запись - заголовок RECORD_HEADER, затем zlib(JSON метаданных) и zlib(тело).
+    Метаданные и тело сжаты отдельно, чтобы индекс строился без распаковки тел.
+    """
+
+    def __init__(self):
+        self.mode: Optional[str] = None
+        self._writer: Optional[BinaryIO] = None
+        self._reader: Optional[BinaryIO] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._index: Dict[str, Tuple[dict, int, int]] = {}
+        self.records = 0
+        self.misses = 0
+
+    @property
+    def is_recording(self) -> bool:
+        return self.mode == 'record'
+
+    @property
+    def is_replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def start_recording(self, path: str):
+        self._writer = open(path, 'ab')
+        self.mode = 'record'
+        logger.info(f"Recording responses to {path}")
+
+    def start_replay(self, path: str):
+        self._reader = open(path, 'rb')
+        self.mode = 'replay'
+
+        if os.fstat(self._reader.fileno()).st_size == 0:
+            # Пустой файл нельзя отобразить в память, воспроизводим пустой архив
+            logger.warning(f"Archive {path} is empty, every request will miss")
+            return
+
+        self._mmap = mmap.mmap(self._reader.fileno(), 0, access=mmap.ACCESS_READ)
+
+        started = time.monotonic()
+        self._build_index()
+        logger.info(f"Loaded archive {path}: {self.records} records, "
+                    f"{len(self._index)} unique requests in {time.monotonic() - started:.2f}s")
+
+    def record(self, key: str, response: httpx.Response):
+        if not self.is_recording:
+            return
+
+        meta = {
+            "key": key,
+            "url": str(response.url),
+            "status": response.status_code,
+            "headers": [(name, value) for name, value in response.headers.items()
+                        if name.lower() not in SKIPPED_HEADERS],
+            "recorded_at": time.time(),
+        }
+        meta_bytes = zlib.compress(json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+        body_bytes = zlib.compress(response.content)
+
+        header = RECORD_HEADER.pack(RECORD_MAGIC, len(meta_bytes), len(body_bytes))
+        self._writer.write(header + meta_bytes + body_bytes)
+        self.records += 1
+
+    def replay(self, key: str) -> httpx.Response:
+        method, url = key.split(' ', 1)
+        request = httpx.Request(method, url)
+
+        entry = self._index.get(key)
+        if entry is None:
+            self.misses += 1
+            raise httpx.ConnectError(f"No archived response for {key}", request=request)
+
+        meta, offset, length = entry
+        body = zlib.decompress(self._mmap[offset:offset + length])
+        return httpx.Response(meta["status"], headers=meta["headers"], content=body, request=request)
+
+    def _build_index(self):
+        offset = 0
+        size = len(self._mmap)
+
+        while offset + RECORD_HEADER.size <= size:
+            magic, meta_len, body_len = RECORD_HEADER.unpack_from(self._mmap, offset)
+            body_offset = offset + RECORD_HEADER.size + meta_len
+
+            if magic != RECORD_MAGIC or body_offset + body_len > size:
+                # Оборванная последняя запись после аварийной остановки записи
+                logger.warning(f"Archive truncated at offset {offset}, ignoring the rest")
+                break
+
+            meta = json.loads(zlib.decompress(self._mmap[offset + RECORD_HEADER.size:body_offset]))
+            # При повторных запросах воспроизводится последний ответ
+            self._index[meta["key"]] = (meta, body_offset, body_len)
+            self.records += 1
+            offset = body_offset + body_len
+
+    def close(self):
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+            logger.info(f"Recorded {self.records} responses")
+        if self._mmap:
+            self._mmap.close()
+            self._mmap = None
+        if self._reader:
+            self._reader.close()
+            self._reader = None
+            if self.misses:
+                logger.warning(f"Replay misses: {self.misses}")
+        self.mode = None
+
+
+response_archive = ResponseArchive()
@@ -1,16 +1,16 @@
 from typing import Optional
-import httpx
 import logging
 
+from src.scrapers.proxy_pool import proxy_pool
+
 logger = logging.getLogger(__name__)
 
 
 class PageScraper:
     async def scrape_page(self, url: str) -> Optional[str]:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=30) as client:
-            try:
-                response = await client.get(url)
-                return response.text
-            except Exception as e:
-                logger.info(f'Ошибка при получении html: {e}')
-                return None
\ No newline at end of file
+        try:
+            response = await proxy_pool.request('GET', url, follow_redirects=True)
+            return response.text
+        except Exception as e:
+            logger.info(f'Ошибка при получении html: {e}')
+            return None
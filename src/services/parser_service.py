@@ -1,12 +1,18 @@
 import asyncio
 import logging
-from typing import List
+from typing import List, Optional
 
+from src.core.settings import settings
 from src.parsers.start_page import StartPageParser
 from src.parsers.category import CategoryParser
 from src.parsers.product_feature import KomusParser
 from src.repository.mongo_client import mongo_client
 from src.repository.repository import ProductRepository
+from src.repository.crawl_state_repository import CrawlStateRepository
+from src.scrapers.endpoint_guard import endpoint_guard
+from src.scrapers.proxy_pool import proxy_pool
+from src.scrapers.response_archive import response_archive
+from src.services.recrawl_scheduler import RecrawlScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -20,9 +26,17 @@ class KomusParserService:
     async def __aenter__(self):
         await mongo_client.connect()
         self.product_repository = ProductRepository()
+        await self.product_repository.ensure_indexes()
+        self.crawl_state_repository = CrawlStateRepository()
+        await self.crawl_state_repository.ensure_indexes()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # Метрики выводим и после аварийного завершения
+        endpoint_guard.log_metrics()
+        proxy_pool.log_metrics()
+        await proxy_pool.close()
+        response_archive.close()
         await mongo_client.disconnect()
 
     async def run_parsing(self):
@@ -44,11 +58,45 @@ class KomusParserService:
             logger.error(f"Critical error: {e}")
             raise
 
-    async def _process_category(self, category_url: str, category_number: int):
+    async def run_fast_parsing(self):
+        logger.info("Starting Komus fast listing parsing")
+
+        processed_categories = await self.start_page_parser.parse_and_process(
+            self._process_category_fast
+        )
+
+        logger.info("Fast parsing completed")
+        logger.info(f"Processed categories: {processed_categories}")
+        logger.info(f"Enriched products: {self.total_products_processed}")
+
+    async def run_incremental(self,
+                              budget_seconds: Optional[float] = None,
+                              budget_requests: Optional[int] = None,
+                              cycles: int = 1,
+                              interval: Optional[float] = None):
+        logger.info("Starting Komus incremental recrawl")
+        interval = settings.recrawl_interval_seconds if interval is None else interval
+        scheduler = RecrawlScheduler(self.crawl_state_repository)
+
+        cycle = 0
+        while not cycles or cycle < cycles:
+            cycle += 1
+            logger.info(f"Recrawl cycle #{cycle}")
+
+            processed = await scheduler.run_cycle(self._process_product, budget_seconds, budget_requests)
+            self.total_products_processed += processed
+
+            endpoint_guard.log_metrics()
+            proxy_pool.log_metrics()
+
+            if not cycles or cycle < cycles:
+                await asyncio.sleep(interval)
+
+    async def _process_category(self, category_url: str, category_number: int, items_count: Optional[int] = None):
         logger.info(f"Processing category #{category_number}: {category_url}")
 
         try:
-            product_links = await self.category_parser.parse_page(category_url)
+            product_links = await self.category_parser.parse_page(category_url, items_count)
 
             if not product_links:
                 logger.warning("No products found in category")
@@ -61,26 +109,57 @@ class KomusParserService:
         except Exception as e:
             logger.error(f"Error processing category: {e}")
 
+    async def _process_category_fast(self, category_url: str, category_number: int,
+                                     items_count: Optional[int] = None):
+        logger.info(f"Processing category #{category_number} (fast): {category_url}")
+
+        try:
+            cards = await self.category_parser.parse_cards(category_url, items_count)
+            if not cards:
+                logger.warning("No products found in category")
+                return
+
+            to_enrich = await self.product_repository.upsert_cards(cards)
+
+            # Полные данные через API только для новых и изменившихся товаров
+            await self._process_products([card.url for card in to_enrich])
+            self.total_products_processed += len(to_enrich)
+
+        except Exception as e:
+            logger.error(f"Error processing category: {e}")
+
     async def _process_products(self, product_links: List[str]):
         for i, product_url in enumerate(product_links, 1):
-            try:
-                logger.info(f"Processing product {i}/{len(product_links)}")
+            logger.info(f"Processing product {i}/{len(product_links)}")
+            await self._process_product(product_url)
 
-                product_id = self._extract_product_id(product_url)
-                if not product_id:
-                    continue
+    async def _process_product(self, product_url: str) -> Optional[bool]:
+        try:
+            product_id = self._extract_product_id(product_url)
+            if not product_id:
+                return None
 
-                product_parser = KomusParser(product_id=product_id, product_url=product_url)
-                product = await product_parser.parse_page()
+            product_parser = KomusParser(product_id=product_id, product_url=product_url)
+            product = await product_parser.parse_page()
 
-                if not product.title.startswith("Ошибка"):
-                    await self.product_repository.save_product(product)
+            changed = None
+            if not product.title.startswith("Ошибка"):
+                changed = await self.product_repository.save_product(product)
 
-                await asyncio.sleep(0.5)
+            if settings.crawl_state_enabled:
+                await self._record_crawl_state(product_id, product_url, changed)
+            await asyncio.sleep(settings.product_delay)
+            return changed
 
-            except Exception as e:
-                logger.error(f"Error processing product {i}: {e}")
-                continue
+        except Exception as e:
+            logger.error(f"Error processing product {product_url}: {e}")
+            return None
+
+    async def _record_crawl_state(self, product_id: str, product_url: str, changed: Optional[bool]):
+        if changed is None:
+            await self.crawl_state_repository.record_failure(product_id, product_url)
+        else:
+            await self.crawl_state_repository.record_fetch(product_id, product_url, changed)
 
     def _extract_product_id(self, url: str) -> str:
         import re
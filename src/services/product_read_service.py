@@ -0,0 +1,60 @@
+import logging
+from typing import List, Optional, Tuple
+
+from src.repository.product_cache import product_cache
+from src.repository.repository import ProductRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ProductReadService:
+    """Чтение товаров для внешних сервисов через LRU кэш"""
+
+    def __init__(self, product_repository: ProductRepository):
+        self.product_repository = product_repository
+
+    async def get_product(self, article: str) -> Optional[dict]:
+        doc = product_cache.get(article)
+        if doc is not None:
+            return doc
+
+        product_cache.start_read(article)
+        doc = None
+        try:
+            doc = await self.product_repository.get_by_article(article)
+        finally:
+            product_cache.finish_read(article, doc)
+        return doc
+
+    async def get_products(self, articles: List[str]) -> List[dict]:
+        found = {}
+        missing = []
+
+        for article in articles:
+            doc = product_cache.get(article)
+            if doc is not None:
+                found[article] = doc
+            else:
+                missing.append(article)
+
+        if missing:
+            for article in missing:
+                product_cache.start_read(article)
+
+            docs = {}
+            try:
+                for doc in await self.product_repository.get_by_articles(missing):
+                    docs[doc["article"]] = doc
+            finally:
+                for article in missing:
+                    product_cache.finish_read(article, docs.get(article))
+            found.update(docs)
+
+        return [found[article] for article in articles if article in found]
+
+    async def list_category(self, category: str, cursor: Optional[str],
+                            limit: int) -> Tuple[List[dict], Optional[str]]:
+        # Запрашиваем на один больше, чтобы понять, есть ли следующая страница
+        docs = await self.product_repository.list_by_category(category, cursor, limit + 1)
+        next_cursor = docs[limit - 1]["article"] if len(docs) > limit else None
+        return docs[:limit], next_cursor
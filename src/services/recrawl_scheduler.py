@@ -0,0 +1,80 @@
+import logging
+import math
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
+
+from src.core.settings import settings
+from src.repository.crawl_state_repository import CrawlStateRepository
+from src.scrapers.endpoint_guard import endpoint_guard
+
+logger = logging.getLogger(__name__)
+
+
+class RecrawlScheduler:
+    """Обходит артикулы в порядке вероятности устаревания в пределах бюджета"""
+
+    def __init__(self, state_repository: CrawlStateRepository):
+        self.state_repository = state_repository
+        self.seeded = False
+
+    def staleness(self, state: dict, now: datetime) -> float:
+        """Вероятность, что товар изменился с последнего скачивания (пуассоновская модель)"""
+        # Неудачи подряд понижают приоритет, last_fetched при этом не меняется
+        failure_penalty = 1 / (1 + state.get("failure_count", 0))
+
+        last_fetched = state.get("last_fetched")
+        if last_fetched is None:
+            return failure_penalty
+
+        first_fetched = state.get("first_fetched") or last_fetched
+        rate = self.state_repository.change_rate(state.get("change_count", 0), first_fetched, now)
+        elapsed_hours = (now - last_fetched).total_seconds() / 3600
+
+        return (1 - math.exp(-rate * elapsed_hours)) * failure_penalty
+
+    async def plan(self) -> List[dict]:
+        now = datetime.utcnow()
+        states = await self.state_repository.get_all()
+        return sorted(states, key=lambda state: self.staleness(state, now), reverse=True)
+
+    async def run_cycle(self,
+                        process_product: Callable[[str], Awaitable[Optional[bool]]],
+                        budget_seconds: Optional[float] = None,
+                        budget_requests: Optional[int] = None) -> int:
+        budget_seconds = settings.recrawl_budget_seconds if budget_seconds is None else budget_seconds
+        budget_requests = settings.recrawl_budget_requests if budget_requests is None else budget_requests
+
+        # Новые артикулы дальше попадают в состояние через record_fetch, сидируем один раз
+        if not self.seeded:
+            seeded = await self.state_repository.seed_from_products()
+            self.seeded = True
+            if seeded:
+                logger.info(f"Seeded crawl state with {seeded} articles")
+
+        queue = await self.plan()
+        logger.info(f"Recrawl cycle: {len(queue)} articles, "
+                    f"budget {budget_seconds}s / {budget_requests} requests")
+
+        started = time.monotonic()
+        start_requests = endpoint_guard.total_requests()
+        processed = 0
+
+        for state in queue:
+            elapsed = time.monotonic() - started
+            used_requests = endpoint_guard.total_requests() - start_requests
+
+            if budget_seconds and elapsed >= budget_seconds:
+                logger.info("Time budget exhausted")
+                break
+            if budget_requests and used_requests >= budget_requests:
+                logger.info("Request budget exhausted")
+                break
+
+            await process_product(state["url"])
+            processed += 1
+
+        logger.info(f"Recrawl cycle finished: {processed} articles, "
+                    f"{endpoint_guard.total_requests() - start_requests} requests, "
+                    f"{time.monotonic() - started:.0f}s")
+        return processed
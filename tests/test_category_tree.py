@@ -0,0 +1,121 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.settings import settings
+from src.parsers.category import CategoryParser
+from src.parsers.start_page import StartPageParser
+
+CATEGORY_URL = "https://www.komus.ru/katalog/bumaga/c/100/"
+
+
+@pytest.fixture(autouse=True)
+def no_delays(monkeypatch):
+    monkeypatch.setattr(settings, "page_delay", 0)
+
+
+class FakeScraper:
+    def __init__(self, items_count: int):
+        self.items_count = items_count
+        self.urls = []
+
+    async def scrape_page(self, url: str) -> str:
+        self.urls.append(url)
+        page = int(url.rsplit("page=", 1)[1])
+        return (
+            f'<span class="catalog__header-sup">{self.items_count}</span>'
+            f'<a class="product-plain__name js-product-variant-name" href="/p/{page}/">Товар</a>'
+        )
+
+
+class FakeTreeRepository:
+    def __init__(self, cached_leaves: int):
+        self.cached = {"nodes": [{"url": str(i), "is_leaf": True} for i in range(cached_leaves)]}
+        self.saved = None
+        self.touched = False
+
+    async def load(self):
+        return self.cached
+
+    async def save(self, nodes):
+        self.saved = nodes
+
+    async def touch(self):
+        self.touched = True
+
+
+def test_cached_items_count_is_extended_from_first_page():
+    parser = CategoryParser()
+    parser.scraper = FakeScraper(items_count=95)
+
+    links = asyncio.run(parser.parse_page(CATEGORY_URL, items_count=30))
+
+    assert len(parser.scraper.urls) == 4
+    assert len(links) == 4
+
+
+def test_cached_items_count_is_kept_when_category_shrinks():
+    parser = CategoryParser()
+    parser.scraper = FakeScraper(items_count=10)
+
+    asyncio.run(parser.parse_page(CATEGORY_URL, items_count=61))
+
+    assert len(parser.scraper.urls) == 3
+
+
+def make_discovery(leaves: int, cached_leaves: int, errors: int = 0) -> StartPageParser:
+    parser = StartPageParser()
+    parser.tree_repository = FakeTreeRepository(cached_leaves)
+    parser.errors = errors
+    for i in range(leaves):
+        parser._add_node(f"leaf-{i}", None, is_leaf=True, items_count=1)
+    return parser
+
+
+def test_partial_discovery_with_errors_keeps_cached_tree_and_refreshes_ttl():
+    parser = make_discovery(leaves=50, cached_leaves=100, errors=3)
+    asyncio.run(parser._save_tree())
+    assert parser.tree_repository.saved is None
+    assert parser.tree_repository.touched
+
+
+def test_clean_discovery_of_shrunk_catalog_replaces_cached_tree():
+    parser = make_discovery(leaves=50, cached_leaves=100)
+    asyncio.run(parser._save_tree())
+    assert len(parser.tree_repository.saved) == 50
+
+
+def test_complete_discovery_replaces_cached_tree():
+    parser = make_discovery(leaves=98, cached_leaves=100)
+    asyncio.run(parser._save_tree())
+    assert len(parser.tree_repository.saved) == 98
+
+
+def test_failed_processing_cancels_revalidation():
+    parser = StartPageParser()
+    revalidation_started = asyncio.Event()
+    revalidation_cancelled = []
+
+    async def slow_revalidation():
+        revalidation_started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            revalidation_cancelled.append(True)
+            raise
+
+    async def failing_category(url, n, items_count):
+        await revalidation_started.wait()
+        raise RuntimeError("category failed")
+
+    parser._revalidate_tree = slow_revalidation
+    parser.process_category = failing_category
+    cached_tree = {
+        "discovered_at": datetime.utcnow() - timedelta(hours=settings.category_tree_ttl_hours + 1),
+        "nodes": [{"url": CATEGORY_URL, "is_leaf": True}],
+    }
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(parser._process_cached_tree(cached_tree))
+    assert revalidation_cancelled == [True]
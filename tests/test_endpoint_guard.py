@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.core.settings import settings
+from src.scrapers.endpoint_guard import CLOSED, HALF_OPEN, OPEN, EndpointGuard
+
+URL = "https://www.komus.ru/api/product/1"
+
+
+@pytest.fixture(autouse=True)
+def fast_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "breaker_failure_threshold", 2)
+    monkeypatch.setattr(settings, "breaker_open_seconds", 0.01)
+    monkeypatch.setattr(settings, "breaker_probe_interval", 0.01)
+
+
+def make_client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def open_breaker(guard: EndpointGuard):
+    breaker = guard._stats(URL).breaker
+    for _ in range(settings.breaker_failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    return breaker
+
+
+def test_breaker_opens_on_error_burst_and_closes_after_probe():
+    guard = EndpointGuard()
+
+    async def run():
+        async with make_client(lambda request: httpx.Response(503)) as client:
+            for _ in range(settings.breaker_failure_threshold):
+                await guard.request(client, "GET", URL)
+        assert guard._stats(URL).breaker.state == OPEN
+
+        async with make_client(lambda request: httpx.Response(200)) as client:
+            await guard.request(client, "GET", URL)
+        assert guard._stats(URL).breaker.state == CLOSED
+
+    asyncio.run(run())
+
+
+def test_unexpected_probe_exception_releases_probe():
+    guard = EndpointGuard()
+    breaker = open_breaker(guard)
+
+    def redirect_loop(request):
+        return httpx.Response(302, headers={"location": URL})
+
+    async def run():
+        async with make_client(redirect_loop) as client:
+            with pytest.raises(httpx.TooManyRedirects):
+                await guard.request(client, "GET", URL, follow_redirects=True)
+
+        assert breaker.state == OPEN
+        assert not breaker.probe_in_flight
+
+        async with make_client(lambda request: httpx.Response(200)) as client:
+            response = await asyncio.wait_for(guard.request(client, "GET", URL), timeout=1)
+        assert response.status_code == 200
+        assert breaker.state == CLOSED
+
+    asyncio.run(run())
+
+
+def test_cancelled_probe_releases_probe():
+    guard = EndpointGuard()
+    breaker = open_breaker(guard)
+
+    async def hang(request):
+        await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    async def run():
+        async with make_client(hang) as client:
+            task = asyncio.create_task(guard.request(client, "GET", URL))
+            await asyncio.sleep(0.05)
+            assert breaker.state == HALF_OPEN
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert not breaker.probe_in_flight
+
+    asyncio.run(run())
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.parsers.category import CategoryParser
+from src.repository.repository import ProductRepository
+from src.schemas.product import ProductCard, stock_status
+
+FIXTURE = Path(__file__).parent / "fixtures" / "listing_page.html"
+
+
+def load_listing() -> BeautifulSoup:
+    return BeautifulSoup(FIXTURE.read_text(encoding="utf-8"), "html.parser")
+
+
+def test_cards_are_extracted_from_listing_page():
+    cards = {card.article: card for card in CategoryParser()._extract_cards(load_listing())}
+
+    assert list(cards) == ["20046", "1009371", "555777"]
+    assert cards["20046"].title == "Бумага для офисной техники SvetoCopy (А4, 80 г/кв.м, 500 листов)"
+    assert cards["20046"].url.startswith("https://www.komus.ru/katalog/")
+    assert cards["20046"].url.endswith("/p/20046/")
+
+
+def test_card_price_skips_old_price_and_prefers_microdata():
+    cards = {card.article: card for card in CategoryParser()._extract_cards(load_listing())}
+
+    assert cards["20046"].price == 419.90
+    assert cards["1009371"].price == 1234.50
+    assert cards["555777"].price is None
+
+
+def test_card_stock_text():
+    cards = {card.article: card for card in CategoryParser()._extract_cards(load_listing())}
+
+    assert cards["20046"].stock == "В наличии 1 250 пачек"
+    assert cards["1009371"].stock == "Осталось мало"
+    assert cards["555777"].stock == "Под заказ"
+
+
+def test_listing_links_and_items_count_match_cards():
+    soup = load_listing()
+    parser = CategoryParser()
+
+    assert len(parser._extract_product_links(soup)) == 3
+    assert parser.get_items_count(soup) == 73
+
+
+def test_stock_quantity_change_does_not_mark_card_changed():
+    repository = ProductRepository()
+    doc = {"listing": {"price": 419.90, "stock": "В наличии 1 250 пачек"}}
+
+    restocked = ProductCard(article="20046", title="Бумага", url="/p/20046/",
+                            price=419.90, stock="В наличии 980 пачек")
+    low = ProductCard(article="20046", title="Бумага", url="/p/20046/",
+                      price=419.90, stock="Осталось мало")
+
+    assert not repository._is_listing_changed(doc, restocked)
+    assert repository._is_listing_changed(doc, low)
+
+
+def test_stock_status_ignores_quantity():
+    assert stock_status("В наличии 1 250 пачек") == stock_status("В наличии 3 пачки") == "in_stock"
+    assert stock_status("Нет в наличии") == "out_of_stock"
+    assert stock_status("Под заказ") == "to_order"
+    assert stock_status("Осталось мало") == "low"
@@ -0,0 +1,67 @@
+import asyncio
+
+from src.repository import product_cache as product_cache_module
+from src.repository.product_cache import ProductCache
+from src.services import product_read_service as read_service_module
+from src.services.product_read_service import ProductReadService
+
+DOC = {"article": "20046", "title": "Бумага"}
+
+
+def test_entries_expire_after_ttl():
+    cache = ProductCache(max_size=10, ttl=0.01)
+    cache.start_read("20046")
+    cache.finish_read("20046", DOC)
+    assert cache.get("20046") == DOC
+
+    asyncio.run(asyncio.sleep(0.02))
+    assert cache.get("20046") is None
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ProductCache(max_size=2, ttl=60)
+    for article in ("1", "2"):
+        cache.start_read(article)
+        cache.finish_read(article, {"article": article})
+    cache.get("1")
+
+    cache.start_read("3")
+    cache.finish_read("3", {"article": "3"})
+
+    assert cache.get("2") is None
+    assert cache.get("1") is not None
+
+
+def test_invalidation_during_read_prevents_stale_put(monkeypatch):
+    cache = ProductCache(max_size=10, ttl=60)
+    monkeypatch.setattr(read_service_module, "product_cache", cache)
+    monkeypatch.setattr(product_cache_module, "product_cache", cache)
+
+    class SlowRepository:
+        def __init__(self):
+            self.reading = asyncio.Event()
+            self.release = asyncio.Event()
+
+        async def get_by_article(self, article):
+            self.reading.set()
+            await self.release.wait()
+            return {"article": article, "title": "old"}
+
+    async def run():
+        repository = SlowRepository()
+        service = ProductReadService(repository)
+
+        read = asyncio.create_task(service.get_product("20046"))
+        await repository.reading.wait()
+        # ProductRepository.save_product записал изменение, пока шло чтение
+        cache.invalidate("20046")
+        repository.release.set()
+
+        assert (await read)["title"] == "old"
+        assert cache.get("20046") is None
+
+        cache.start_read("20046")
+        cache.finish_read("20046", {"article": "20046", "title": "new"})
+        assert cache.get("20046")["title"] == "new"
+
+    asyncio.run(run())
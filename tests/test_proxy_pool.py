@@ -0,0 +1,203 @@
+import asyncio
+import socket
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+from src.core.settings import settings
+from src.scrapers import proxy_pool as proxy_pool_module
+from src.scrapers.endpoint_guard import CLOSED, EndpointGuard
+from src.scrapers.proxy_pool import ProxyEndpoint, ProxyPool
+
+# Обычный http: запрос через прокси уходит абсолютным URI на сам прокси
+URL = "http://www.komus.ru/api/product/1"
+
+
+@pytest.fixture(autouse=True)
+def guard(monkeypatch):
+    guard = EndpointGuard()
+    monkeypatch.setattr(proxy_pool_module, "endpoint_guard", guard)
+    monkeypatch.setattr(settings, "proxy_bench_failures", 3)
+    monkeypatch.setattr(settings, "proxy_bench_seconds", 60.0)
+    monkeypatch.setattr(settings, "proxy_max_bench_seconds", 240.0)
+    return guard
+
+
+@asynccontextmanager
+async def stub_proxy(status: int = 200):
+    """Локальный прокси-заглушка: отвечает сам, не обращаясь к komus.ru"""
+    hits = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                while (await reader.readline()) not in (b"\r\n", b""):
+                    pass
+
+                hits.append(request_line.decode().split(" ")[1])
+                writer.write(f"HTTP/1.1 {status} Stub\r\nContent-Length: 2\r\n\r\nok".encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}", hits
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def dead_proxy_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def test_requests_go_through_stub_proxy():
+    async def run():
+        async with stub_proxy() as (proxy_url, hits):
+            pool = ProxyPool([proxy_url])
+            response = await pool.request("GET", URL)
+            await pool.close()
+
+        assert response.status_code == 200
+        assert hits == [URL]
+
+    asyncio.run(run())
+
+
+def test_throttled_proxy_is_benched_without_opening_endpoint_breaker(guard):
+    async def run():
+        async with stub_proxy(status=429) as (throttled_url, _), stub_proxy() as (healthy_url, healthy_hits):
+            pool = ProxyPool([throttled_url])
+            throttled = pool.endpoints[0]
+
+            for _ in range(settings.proxy_bench_failures):
+                response = await pool.request("GET", URL)
+                assert response.status_code == 429
+
+            assert throttled.is_benched(time.monotonic())
+
+            pool.endpoints.append(ProxyEndpoint(healthy_url))
+            for _ in range(5):
+                await pool.request("GET", URL)
+            await pool.close()
+
+        assert len(healthy_hits) == 5
+        assert all(stats.breaker.state == CLOSED for stats in guard.endpoints.values())
+        assert all(stats.failures == 0 for stats in guard.endpoints.values())
+
+    asyncio.run(run())
+
+
+def test_dead_proxy_is_benched_and_not_counted_against_endpoint(guard):
+    async def run():
+        pool = ProxyPool([dead_proxy_url()])
+        dead = pool.endpoints[0]
+
+        for _ in range(settings.proxy_bench_failures):
+            with pytest.raises(httpx.ConnectError):
+                await pool.request("GET", URL)
+        await pool.close()
+
+        assert dead.is_benched(time.monotonic())
+        assert all(stats.failures == 0 for stats in guard.endpoints.values())
+        assert all(stats.breaker.state == CLOSED for stats in guard.endpoints.values())
+
+    asyncio.run(run())
+
+
+def test_silent_proxy_timeout_is_not_counted_against_endpoint(guard, monkeypatch):
+    monkeypatch.setattr(settings, "breaker_failure_threshold", 3)
+
+    def drop_connection(request: httpx.Request):
+        raise httpx.ConnectTimeout("proxy did not accept the connection", request=request)
+
+    async def run():
+        pool = ProxyPool(["http://silent-proxy"])
+        silent = pool.endpoints[0]
+        silent.client = httpx.AsyncClient(transport=httpx.MockTransport(drop_connection))
+
+        for _ in range(settings.proxy_bench_failures):
+            with pytest.raises(httpx.ConnectTimeout):
+                await pool.request("GET", URL)
+        await pool.close()
+
+        assert silent.is_benched(time.monotonic())
+        assert all(stats.breaker.state == CLOSED for stats in guard.endpoints.values())
+        assert all(stats.timeouts == 0 for stats in guard.endpoints.values())
+        assert all(not stats.latency.samples for stats in guard.endpoints.values())
+
+    asyncio.run(run())
+
+
+def test_upstream_5xx_does_not_bench_proxy():
+    async def run():
+        async with stub_proxy(status=503) as (proxy_url, _):
+            pool = ProxyPool([proxy_url])
+            for _ in range(settings.proxy_bench_failures + 1):
+                await pool.request("GET", URL)
+            await pool.close()
+
+        proxy = pool.endpoints[0]
+        assert proxy.benched_until == 0
+        assert proxy.error_rate == 0
+
+    asyncio.run(run())
+
+
+def test_score_prefers_fast_healthy_proxy():
+    fast, slow, failing = ProxyEndpoint("http://fast"), ProxyEndpoint("http://slow"), ProxyEndpoint("http://bad")
+    for _ in range(5):
+        fast.record(0.1, 200)
+        slow.record(1.0, 200)
+        failing.record(0.1, 200)
+    failing.record(None, None)
+
+    assert fast.score() > slow.score()
+    assert fast.score() > failing.score()
+
+
+def test_bench_backoff_doubles_and_resets_after_success():
+    proxy = ProxyEndpoint("http://stub")
+
+    for _ in range(settings.proxy_bench_failures):
+        proxy.record(None, None)
+    assert proxy.benched_until > 0
+    assert proxy.bench_seconds == 120.0
+
+    for _ in range(settings.proxy_bench_failures):
+        proxy.record(None, None)
+    assert proxy.bench_seconds == 240.0
+
+    for _ in range(settings.proxy_bench_failures):
+        proxy.record(None, None)
+    assert proxy.bench_seconds == settings.proxy_max_bench_seconds
+
+    proxy.record(0.1, 200)
+    assert proxy.bench_seconds == settings.proxy_bench_seconds
+
+
+def test_acquire_waits_when_every_proxy_is_benched(monkeypatch):
+    monkeypatch.setattr(settings, "proxy_bench_seconds", 0.05)
+
+    async def run():
+        pool = ProxyPool([])
+        direct = pool.endpoints[0]
+        for _ in range(settings.proxy_bench_failures):
+            direct.record(0.1, 429)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        assert await pool.acquire() is direct
+        assert loop.time() - started >= 0.04
+
+    asyncio.run(run())
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from src.repository.crawl_state_repository import CrawlStateRepository
+from src.services.recrawl_scheduler import RecrawlScheduler
+
+NOW = datetime(2026, 1, 1)
+
+
+def state(changes: int, fetched_hours_ago: float, failures: int = 0) -> dict:
+    return {
+        "first_fetched": NOW - timedelta(days=30),
+        "last_fetched": NOW - timedelta(hours=fetched_hours_ago),
+        "change_count": changes,
+        "failure_count": failures,
+    }
+
+
+def test_frequently_changing_article_is_staler():
+    scheduler = RecrawlScheduler(CrawlStateRepository())
+
+    hourly = scheduler.staleness(state(changes=600, fetched_hours_ago=2), NOW)
+    monthly = scheduler.staleness(state(changes=1, fetched_hours_ago=2), NOW)
+
+    assert hourly > monthly
+
+
+def test_never_fetched_article_comes_first():
+    scheduler = RecrawlScheduler(CrawlStateRepository())
+
+    assert scheduler.staleness({}, NOW) == 1.0
+    assert scheduler.staleness(state(changes=10, fetched_hours_ago=48), NOW) < 1.0
+
+
+def test_repeated_failures_lower_priority():
+    scheduler = RecrawlScheduler(CrawlStateRepository())
+
+    healthy = scheduler.staleness(state(changes=10, fetched_hours_ago=24), NOW)
+    failing = scheduler.staleness(state(changes=10, fetched_hours_ago=24, failures=3), NOW)
+
+    assert failing < healthy
+    assert scheduler.staleness({"failure_count": 1}, NOW) < 1.0
@@ -0,0 +1,76 @@
+import gzip
+
+import httpx
+import pytest
+
+from src.scrapers.response_archive import ResponseArchive, request_key
+
+URL = "https://www.komus.ru/api/product/1"
+
+
+def make_response(body: bytes, status: int = 200) -> httpx.Response:
+    return httpx.Response(
+        status,
+        headers={"content-type": "application/json", "content-encoding": "gzip"},
+        content=gzip.compress(body),
+        request=httpx.Request("GET", URL),
+    )
+
+
+def record(path, *responses):
+    archive = ResponseArchive()
+    archive.start_recording(str(path))
+    for key, response in responses:
+        archive.record(key, response)
+    archive.close()
+
+
+def test_recorded_response_is_replayed(tmp_path):
+    path = tmp_path / "archive.kra"
+    key = request_key("GET", URL, {"fields": "name"})
+    record(path, (key, make_response(b'{"name": "old"}')), (key, make_response(b'{"name": "new"}')))
+
+    archive = ResponseArchive()
+    archive.start_replay(str(path))
+    response = archive.replay(key)
+    archive.close()
+
+    assert response.status_code == 200
+    assert response.json() == {"name": "new"}
+    assert "content-encoding" not in response.headers
+
+
+def test_missing_request_fails_like_connection_error(tmp_path):
+    path = tmp_path / "archive.kra"
+    record(path, (request_key("GET", URL), make_response(b"{}")))
+
+    archive = ResponseArchive()
+    archive.start_replay(str(path))
+    with pytest.raises(httpx.ConnectError):
+        archive.replay(request_key("GET", URL + "?x=1"))
+    archive.close()
+
+
+def test_empty_archive_replays_without_crashing(tmp_path):
+    path = tmp_path / "empty.kra"
+    path.touch()
+
+    archive = ResponseArchive()
+    archive.start_replay(str(path))
+    with pytest.raises(httpx.ConnectError):
+        archive.replay(request_key("GET", URL))
+    archive.close()
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    path = tmp_path / "archive.kra"
+    key = request_key("GET", URL)
+    record(path, (key, make_response(b'{"ok": true}')))
+    with open(path, "ab") as f:
+        f.write(b"KRA1\xff\xff\x00\x00\x10\x00\x00\x00partial")
+
+    archive = ResponseArchive()
+    archive.start_replay(str(path))
+    assert archive.records == 1
+    assert archive.replay(key).json() == {"ok": True}
+    archive.close()